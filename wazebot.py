@@ -1,8 +1,21 @@
 import os
+import asyncio
+import codecs
+import functools
+import http.cookiejar
 import re
 import logging
+import socket
+import threading
+import orjson
 import requests
-from urllib.parse import urlparse, parse_qs, unquote
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar, extract_cookies_to_jar
+from urllib3.util.retry import Retry
+from urllib.parse import unquote, unquote_plus, urljoin
 from telegram import Update
 from telegram.ext import (
     ApplicationBuilder,
@@ -12,37 +25,149 @@ from telegram.ext import (
     filters,
 )
 
+# Use the linear-time RE2 engine (google-re2) when it's installed. It doesn't support
+# lookarounds, so only the patterns that don't need them are compiled with it. RE2's \d and \s
+# are ASCII-only, so those patterns spell out their character classes instead (see
+# WHITESPACE_CHARS) to behave the same whichever engine compiles them.
+try:
+    import re2 as fast_re
+except ImportError:
+    fast_re = re
+
 # Read the bot token from the environment
 TELEGRAM_TOKEN = os.environ.get("TELEGRAM_TOKEN")
 if not TELEGRAM_TOKEN:
     raise RuntimeError("Please set the TELEGRAM_TOKEN environment variable.")
 
-# Global variable to track browser health
+# Shared HTTP session for every outgoing request, so repeated requests to the same
+# hosts (Google, Nominatim) reuse pooled keep-alive connections
+SESSION = requests.Session()
+HTTP_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=Retry(total=1, backoff_factor=0.1))
+SESSION.mount("https://", HTTP_ADAPTER)
+SESSION.mount("http://", HTTP_ADAPTER)
+# Pool connections but not cookies: Google/Nominatim Set-Cookie values (NID, consent, ...) must not
+# be replayed on later requests from other chats, so every request stays as stateless as requests.get
+SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+# Default to a desktop browser User-Agent; resolvers that need a different one pass their own headers
+SESSION.headers.update({
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/114.0.0.0 Safari/537.36"
+    )
+})
+
+# Worker threads for firing independent fallback requests concurrently (see first_successful)
+FANOUT_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fanout")
+
+# Global variable to track browser health, set by the lazy check on first use (see update_browser_health)
 BROWSER_HEALTHY = True
-BROWSER_HEALTH_CHECKED = False
+BROWSER_HEALTH_TASK = None
+
+# Optimized Chromium args for server environments, shared by every browser launch
+CHROMIUM_ARGS = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--disable-extensions',
+    '--disable-plugins',
+    '--disable-images',  # Faster loading
+    '--disable-gpu',
+    '--disable-software-rasterizer',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-ipc-flooding-protection',
+    '--single-process',  # Important for server environments
+    '--no-zygote',  # Disable zygote process
+    '--disable-sync',
+    '--disable-default-apps',
+    '--no-first-run',
+    '--disable-crashpad',
+)
+
+# Resource types the headless browser doesn't need to load to resolve a URL
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media", "websocket"}
+
+# Every character Python's re treats as \s (Unicode whitespace), for patterns compiled with fast_re
+WHITESPACE_CHARS = "\t-\r\x1c-\x20\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
 
 # ─── Regex patterns to extract Google Maps URLs from text ─────────────────────
-GOOGLE_MAPS_URL_PATTERN = re.compile(
-    r'https?://(?:www\.)?(?:maps\.app\.goo\.gl|goo\.gl/maps|maps\.google\.com|google\.com/maps)[^\s]*',
-    re.IGNORECASE
+GOOGLE_MAPS_URL_PATTERN = fast_re.compile(
+    r'(?i)https?://(?:www\.)?(?:maps\.app\.goo\.gl|goo\.gl/maps|maps\.google\.com|google\.com/maps)'
+    f'[^{WHITESPACE_CHARS}]*'
 )
 
 # ─── Regex patterns to find numeric coordinates in a Google Maps URL ───────────────
 # 1) /@<lat>,<lon>,<zoom>/
 # 2) ?api=1&query=<lat>,<lon>
 # 3) !3d<lat>!4d<lon>
-# 4) fallback: any "<lat>,<lon>" anywhere in the URL (not in the full text)
-COORD_PATTERN_AT   = re.compile(r"/@(-?\d+\.\d+),(-?\d+\.\d+),")
-COORD_PATTERN_Q    = re.compile(r"[?&]query=(-?\d+\.\d+),(-?\d+\.\d+)")
-COORD_PATTERN_BANG = re.compile(r"!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)")
-COORD_PATTERN_ANY  = re.compile(r"@?(-?\d+\.\d+),\s*(-?\d+\.\d+)")
+# 4) fallback: any "<lat>,<lon>" anywhere in the URL (not in the full text), with optional
+#    whitespace after the comma (e.g. "?q=38.7,  -9.1"), bounded to at most 3 integer digits
+#    and delimited on both sides so long numeric runs can't backtrack
+# All four are combined into one alternation so the URL is scanned in a single pass.
+# Only the lat/lon pairs are captured: form N uses groups 2N-1 and 2N, so match.lastindex // 2
+# tells which form matched, and that number is also its priority.
+COORD_PATTERN = re.compile(
+    r"/@(-?\d+\.\d+),(-?\d+\.\d+),"
+    r"|[?&]query=(-?\d+\.\d+),(-?\d+\.\d+)"
+    r"|!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)"
+    r"|@?(?<![\d.])(-?\d{1,3}\.\d+),\s*(-?\d{1,3}\.\d+)(?![\d.])"
+)
+COORD_PATTERN_NAMES = {1: "AT", 2: "Q", 3: "BANG", 4: "ANY"}
 
 # Pattern to extract coordinates from directions URLs (/dir/from/to/...)
 # Format: /dir/start_lat,start_lon/dest_lat,dest_lon/...
-DIRECTIONS_PATTERN = re.compile(r"/dir/(-?\d+\.\d+),(-?\d+\.\d+)/(-?\d+\.\d+),(-?\d+\.\d+)")
+DIRECTIONS_PATTERN = fast_re.compile(r"/dir/(-?[0-9]+\.[0-9]+),(-?[0-9]+\.[0-9]+)/(-?[0-9]+\.[0-9]+),(-?[0-9]+\.[0-9]+)")
 
 # Pattern to extract place ID from Google Maps URLs
-PLACE_ID_PATTERN = re.compile(r"1s0x[a-f0-9]+:0x[a-f0-9]+")
+PLACE_ID_PATTERN = fast_re.compile(r"1s0x[a-f0-9]+:0x[a-f0-9]+")
+
+# Fallback patterns for directions URLs: the /dir/ path segment and every <lat>,<lon> pair in it
+DIRECTIONS_PATH_PATTERN = fast_re.compile(r"/dir/([^?#]+)")
+COORD_PAIR_PATTERN = fast_re.compile(r"(-?[0-9]+\.[0-9]+),(-?[0-9]+\.[0-9]+)")
+
+# Trailing punctuation that gets caught when extracting a URL from message text
+TRAILING_PUNCTUATION_PATTERN = re.compile(r"[^\w\-\./?=&:]+$")
+
+# Extra headers for alternative place URLs that might bypass the consent page
+ALT_HEADERS_EXTRA = {
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'DNT': '1',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+# Nominatim search endpoint (query parameters are passed separately and encoded by requests)
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+
+# Nominatim rate limiting (see wait_for_nominatim_slot) and how many queries may be in flight at once
+NOMINATIM_MIN_INTERVAL = 1.0
+NOMINATIM_CONCURRENCY = 2
+NOMINATIM_LAST_REQUEST = 0.0
+NOMINATIM_RATE_LOCK = asyncio.Lock()
+
+# Hosts the fallback resolvers talk to; resolved once in the background at startup (see prewarm_dns)
+PREWARM_HOSTS = (
+    "www.google.com",
+    "maps.google.com",
+    "maps.googleapis.com",
+    "maps.google.co.uk",
+    "maps.google.de",
+    "maps.google.ca",
+    "nominatim.openstreetmap.org",
+)
+
+# Coordinates in search result pages appear near the top; don't download more than this
+RESPONSE_SCAN_LIMIT = 32 * 1024
+# Text from the previous chunk that is scanned again with the next one, longer than any realistic
+# coordinate match, so a match split across two chunks is still found
+RESPONSE_SCAN_OVERLAP = 256
+
+# Google consent redirects we need to unwrap (see strip_consent_url)
+CONSENT_URL_PREFIXES = ("https://consent.google.com/", "http://consent.google.com/")
+CONSENT_CONTINUE_PATTERN = re.compile(r"https?://consent\.google\.com/[^?#]*\?(?:[^&#]*&)*?continue=([^&#]+)")
 
 # Configure logging
 logging.basicConfig(
@@ -52,6 +177,43 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class ResultCache:
+    """
+    Small thread-safe LRU cache for resolved coordinates.
+    Only successful lookups are stored, so transient network failures are retried next time.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value) -> None:
+        if value is None:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# Place ID -> (lat, lon). Popular places get shared a lot and their coordinates don't change.
+PLACE_ID_CACHE = ResultCache(maxsize=4096)
+
+# Geocoding results, keyed by normalized Nominatim query and by the place name from the URL,
+# so repeat links skip both the Nominatim round trips and the politeness delays
+GEOCODE_QUERY_CACHE = ResultCache(maxsize=2048)
+GEOCODE_PLACE_CACHE = ResultCache(maxsize=2048)
+
+
 def extract_google_maps_urls(text: str) -> list[str]:
     """
     Extract all Google Maps URLs from the given text.
@@ -61,6 +223,28 @@ def extract_google_maps_urls(text: str) -> list[str]:
     return urls
 
 
+def first_successful(
+    resolver: Callable[[str], tuple[float, float] | None], items: Iterable[str]
+) -> tuple[float, float] | None:
+    """
+    Run resolver(item) for all items concurrently and return the first result that is not None
+    in the order the items are given, so a quick answer for a lower-priority item never beats
+    a higher-priority one. Attempts that haven't started yet are cancelled once the result is known.
+    The resolver is expected to handle and log its own errors.
+    """
+    futures = [FANOUT_EXECUTOR.submit(resolver, item) for item in items]
+    try:
+        for future in futures:
+            result = future.result()
+            if result:
+                return result
+    finally:
+        for future in futures:
+            future.cancel()
+    return None
+
+
+@functools.lru_cache(maxsize=2048)
 def extract_coordinates_from_google_url(url: str) -> tuple[float, float] | None:
     """
     Attempt to extract a (lat, lon) pair from a Google Maps URL using multiple patterns:
@@ -69,48 +253,72 @@ def extract_coordinates_from_google_url(url: str) -> tuple[float, float] | None:
       2. ?api=1&query=<lat>,<lon>
       3. !3d<lat>!4d<lon>
       4. Fallback: any "<lat>,<lon>" anywhere
+    Results are memoized per URL; use extract_coordinates_from_text for page bodies.
     """
-    logger.info(f"Extracting coordinates from URL: {url}")
+    logger.info("Extracting coordinates from URL: %s", url)
     
     # 0) Check for directions URLs first - extract destination coordinates
     if '/dir/' in url:
         logger.info("Detected directions URL - calling extract_coordinates_from_directions_url")
         coords = extract_coordinates_from_directions_url(url)
         if coords:
-            logger.info(f"Successfully extracted coordinates from directions URL: {coords}")
+            logger.info("Successfully extracted coordinates from directions URL: %s", coords)
             return coords
         else:
             logger.info("Failed to extract coordinates from directions URL, trying other methods")
     
-    # 1) /@LAT,LON,…
-    match = COORD_PATTERN_AT.search(url)
-    if match:
-        logger.info(f"Found coordinates with COORD_PATTERN_AT: {match.groups()}")
-        return float(match.group(1)), float(match.group(2))
+    # 1-4) Single scan over the URL, keeping the highest-priority form found.
+    # The ANY fallback is skipped for directions URLs to avoid picking up starting coordinates.
+    found = find_coordinate_pattern(url, skip_fallback='/dir/' in url)
+    if found:
+        coords, form = found
+        logger.info("Found coordinates with COORD_PATTERN (%s): %s", COORD_PATTERN_NAMES[form], coords)
+        return coords
 
-    # 2) ?api=1&query=LAT,LON
-    match = COORD_PATTERN_Q.search(url)
-    if match:
-        logger.info(f"Found coordinates with COORD_PATTERN_Q: {match.groups()}")
-        return float(match.group(1)), float(match.group(2))
+    logger.info("No coordinates found with any pattern")
+    return None
 
-    # 3) !3dLAT!4dLON
-    match = COORD_PATTERN_BANG.search(url)
-    if match:
-        logger.info(f"Found coordinates with COORD_PATTERN_BANG: {match.groups()}")
-        return float(match.group(1)), float(match.group(2))
 
-    # 4) Fallback: any "LAT,LON" in the URL (but not for directions URLs)
-    if '/dir/' not in url:  # Avoid picking up starting coordinates in directions URLs
-        match = COORD_PATTERN_ANY.search(url)
-        if match:
-            logger.info(f"Found coordinates with COORD_PATTERN_ANY: {match.groups()}")
-            return float(match.group(1)), float(match.group(2))
+def find_coordinate_pattern(text: str, skip_fallback: bool = False) -> tuple[tuple[float, float], int] | None:
+    """
+    Scan the text once with COORD_PATTERN and return the coordinates of the highest-priority
+    form found together with that form's number, or None. Doesn't log anything.
+    """
+    best = None
+    best_form = None
+    for match in COORD_PATTERN.finditer(text):
+        form = match.lastindex // 2
+        if form == 4 and skip_fallback:
+            continue
+        if best is None or form < best_form:
+            best, best_form = match, form
+            if form == 1:
+                break
 
-    logger.info("No coordinates found with any pattern")
+    if best:
+        lat, lon = best.group(best.lastindex - 1, best.lastindex)
+        return (float(lat), float(lon)), best_form
     return None
 
 
+def extract_coordinates_from_text(text: str, is_directions: bool = False) -> tuple[float, float] | None:
+    """
+    Like extract_coordinates_from_google_url, for page bodies: uncached (they rarely repeat
+    and would only bloat the cache) and without logging the (possibly long) text.
+    Pass is_directions=True when this is part of a page that mentioned /dir/ earlier.
+    """
+    is_directions = is_directions or '/dir/' in text
+    if is_directions:
+        # Destination of a directions link in the page
+        match = DIRECTIONS_PATTERN.search(text)
+        if match:
+            return float(match.group(3)), float(match.group(4))
+
+    found = find_coordinate_pattern(text, skip_fallback=is_directions)
+    return found[0] if found else None
+
+
+@functools.lru_cache(maxsize=2048)
 def extract_place_id(url: str) -> str | None:
     """
     Extract place ID from a Google Maps URL.
@@ -127,15 +335,90 @@ def strip_consent_url(url: str) -> str:
     If the URL is a Google consent redirect (e.g. "https://consent.google.com/m?continue=<real_url>&..."),
     extract and return the <real_url> value. Otherwise, return the URL unchanged.
     """
-    parsed = urlparse(url)
-    if parsed.netloc.endswith("consent.google.com"):
-        qs = parse_qs(parsed.query)
-        if "continue" in qs:
-            real_url = qs["continue"][0]
-            return unquote(real_url)
+    # Cheap prefix check first - most URLs are not consent redirects
+    if not url.startswith(CONSENT_URL_PREFIXES):
+        return url
+
+    # Pull out just the continue= parameter instead of parsing the whole query string.
+    # It is decoded as a query value first, then once more for the escapes of the real URL itself.
+    match = CONSENT_CONTINUE_PATTERN.match(url)
+    if match:
+        return unquote(unquote_plus(match.group(1)))
     return url
 
 
+def scan_response_for_coordinates(url: str, headers: dict, timeout: float) -> tuple[float, float] | None:
+    """
+    Stream a GET response and look for coordinates in its body, stopping at the first match
+    or after RESPONSE_SCAN_LIMIT bytes instead of downloading whole search result pages.
+    """
+    with SESSION.get(url, headers=headers, timeout=timeout, stream=True) as resp:
+        if resp.status_code != 200:
+            return None
+
+        # Each chunk is decoded once and scanned together with the tail of the text before it,
+        # instead of rescanning the whole body every time
+        decoder = codecs.getincrementaldecoder('utf-8')('ignore')
+        received = 0
+        pending = ''
+        is_directions = False
+        for chunk in resp.iter_content(chunk_size=8192):
+            received += len(chunk)
+            done = received >= RESPONSE_SCAN_LIMIT
+            text = pending + decoder.decode(chunk, final=done)
+            # Don't match a number that is cut off at the end of this chunk
+            end = len(text) if done else len(text.rstrip("0123456789.,-"))
+            coords = extract_coordinates_from_text(text[:end], is_directions)
+            if coords or done:
+                return coords
+            is_directions = is_directions or '/dir/' in text[:end]
+
+            # Keep an overlap for the next scan, widened to start before any number it cuts into
+            # so a partial number can't match on its own
+            start = max(0, end - RESPONSE_SCAN_OVERLAP)
+            while start > 0 and text[start - 1] in "0123456789.-":
+                start -= 1
+            pending = text[start:]
+
+        return extract_coordinates_from_text(pending + decoder.decode(b'', final=True), is_directions)
+
+
+def chase_redirects_for_coordinates(
+    url: str, headers: dict, timeout: float, max_hops: int | None = None
+) -> tuple[float, float] | None:
+    """
+    Follow redirects one hop at a time and check every Location (with consent stripped)
+    for coordinates. Google often puts them in an early redirect, so we can stop there
+    instead of following the whole chain and downloading the final page.
+    Cookies set along the chain are carried to later hops, like a normal redirect chase,
+    and max_hops defaults to the same limit requests uses (SESSION.max_redirects).
+    """
+    if max_hops is None:
+        max_hops = SESSION.max_redirects
+    # Per-chase cookie jar: the shared session keeps no cookies between requests
+    cookies = RequestsCookieJar()
+    current = url
+    for _ in range(max_hops):
+        with SESSION.get(
+            current, headers=headers, cookies=cookies, timeout=timeout, allow_redirects=False, stream=True
+        ) as resp:
+            if not resp.is_redirect:
+                # Final destination - this is the URL a full redirect chase would have ended on
+                return extract_coordinates_from_google_url(strip_consent_url(current))
+            extract_cookies_to_jar(cookies, resp.request, resp.raw)
+            current = urljoin(current, resp.headers["Location"])
+            # Read the (tiny) redirect body so the connection goes back to the pool
+            resp.content
+
+        logger.info("Redirected to: %s", current)
+        coords = extract_coordinates_from_google_url(strip_consent_url(current))
+        if coords:
+            return coords
+
+    logger.info("Gave up after %s redirects: %s", max_hops, current)
+    return None
+
+
 def try_get_coordinates_from_place_url(url: str, headers: dict) -> tuple[float, float] | None:
     """
     Try to get coordinates from a Google Maps place URL by making additional requests
@@ -143,82 +426,60 @@ def try_get_coordinates_from_place_url(url: str, headers: dict) -> tuple[float,
     """
     try:
         # First, try to make a request to the place URL
-        logger.info(f"Making additional request to place URL: {url}")
-        resp = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
-        final_url = resp.url
-        logger.info(f"Place URL final redirect: {final_url}")
-        
-        # Strip consent from the final URL as well
-        final_url = strip_consent_url(final_url)
-        logger.info(f"After stripping consent from final URL: {final_url}")
-        
-        # Try to extract coordinates from the final URL
-        coords = extract_coordinates_from_google_url(final_url)
+        logger.info("Making additional request to place URL: %s", url)
+        coords = chase_redirects_for_coordinates(url, headers, timeout=10)
         if coords:
             return coords
             
         # If that didn't work, try extracting place ID and use alternative approaches
         place_id = extract_place_id(url)
         if place_id:
-            logger.info(f"Found place ID: {place_id}")
+            logger.info("Found place ID: %s", place_id)
             
             # Try multiple alternative URL patterns
-            alternative_urls = [
-                f"https://maps.google.com/maps?cid={place_id.split(':')[1]}",
+            cid = place_id.split(':', 1)[1]
+            alternative_urls = (
+                f"https://maps.google.com/maps?cid={cid}",
                 f"https://www.google.com/maps/@?api=1&map_action=pano&pano={place_id}",
                 f"https://www.google.com/maps/search/?api=1&query=place_id:{place_id}",
                 f"https://maps.google.com/?q=place_id:{place_id}",
                 f"https://www.google.com/maps/place/{place_id}",
-            ]
+            )
             
-            for alt_url in alternative_urls:
+            # Try with different headers that might bypass consent
+            alt_headers = {**headers, **ALT_HEADERS_EXTRA}
+            
+            def try_alternative_url(alt_url: str) -> tuple[float, float] | None:
                 try:
-                    logger.info(f"Trying alternative URL: {alt_url}")
-                    
-                    # Try with different headers that might bypass consent
-                    alt_headers = headers.copy()
-                    alt_headers.update({
-                        'Accept-Language': 'en-US,en;q=0.9',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                        'DNT': '1',
-                        'Upgrade-Insecure-Requests': '1',
-                    })
+                    logger.info("Trying alternative URL: %s", alt_url)
                     
-                    resp = requests.get(alt_url, headers=alt_headers, timeout=10, allow_redirects=True)
-                    final_url = resp.url
-                    logger.info(f"Alternative URL final redirect: {final_url}")
-                    
-                    # Strip consent if present
-                    final_url = strip_consent_url(final_url)
-                    logger.info(f"After stripping consent: {final_url}")
-                    
-                    coords = extract_coordinates_from_google_url(final_url)
+                    coords = chase_redirects_for_coordinates(alt_url, alt_headers, timeout=10)
                     if coords:
-                        logger.info(f"Success with alternative URL: {alt_url}")
+                        logger.info("Success with alternative URL: %s", alt_url)
                         return coords
                         
                 except Exception as e:
-                    logger.info(f"Alternative URL {alt_url} failed: {e}")
-                    continue
+                    logger.info("Alternative URL %s failed: %s", alt_url, e)
+                return None
+            
+            # The alternatives are independent, so fire them all at once
+            coords = first_successful(try_alternative_url, alternative_urls)
+            if coords:
+                return coords
         
         # Last resort: try to use Google's embed API which might work differently  
         if place_id:
             embed_url = f"https://www.google.com/maps/embed/v1/place?key=&q=place_id:{place_id}"
             try:
-                logger.info(f"Trying embed URL: {embed_url}")
-                resp = requests.get(embed_url, headers=headers, timeout=10, allow_redirects=True)
-                final_url = resp.url
-                logger.info(f"Embed URL final redirect: {final_url}")
-                
-                final_url = strip_consent_url(final_url)
-                coords = extract_coordinates_from_google_url(final_url)
+                logger.info("Trying embed URL: %s", embed_url)
+                coords = chase_redirects_for_coordinates(embed_url, headers, timeout=10)
                 if coords:
                     return coords
             except Exception as e:
-                logger.info(f"Embed URL failed: {e}")
+                logger.info("Embed URL failed: %s", e)
                 
     except Exception as e:
-        logger.error(f"Error in try_get_coordinates_from_place_url: {e}")
+        logger.error("Error in try_get_coordinates_from_place_url: %s", e)
     
     return None
 
@@ -227,55 +488,24 @@ def extract_coordinates_from_place_url_params(url: str) -> tuple[float, float] |
     """
     Try to extract coordinates from URL parameters or fragments that might contain them.
     Some Google Maps URLs embed coordinates in different parts of the URL.
+    The URL itself is scanned with the same patterns as extract_coordinates_from_google_url,
+    followed by the URL-decoded data= fragment.
     """
     try:
-        # First check if this is a directions URL
-        if '/dir/' in url:
-            coords = extract_coordinates_from_directions_url(url)
-            if coords:
-                return coords
-        
-        # Look for coordinates in various URL parameter patterns
-        patterns_to_try = [
-            # Look for !3d and !4d patterns in URL fragments
-            r"!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)",
-            # Look for coordinates in @ patterns 
-            r"@(-?\d+\.\d+),(-?\d+\.\d+)",
-            # Look for coordinates after equal signs
-            r"=(-?\d+\.\d+),(-?\d+\.\d+)",
-            # Look for coordinates in query parameters
-            r"[?&](?:q|query|ll|center)=(-?\d+\.\d+)[,\s]+(-?\d+\.\d+)",
-        ]
-        
-        for pattern in patterns_to_try:
-            matches = re.findall(pattern, url)
-            if matches:
-                # Take the first match
-                lat, lon = matches[0]
-                return float(lat), float(lon)
-                
-        # Also check URL fragments after # or data=
-        if 'data=' in url:
-            data_part = url.split('data=')[1].split('&')[0]
-            # URL decode the data part
-            from urllib.parse import unquote
+        coords = extract_coordinates_from_google_url(url)
+        if coords:
+            return coords
+
+        # Also check URL fragments after data=
+        _, found, rest = url.partition('data=')
+        if found:
+            data_part, _, _ = rest.partition('&')
             decoded_data = unquote(data_part)
-            logger.info(f"Checking decoded data part: {decoded_data}")
-            
-            # Check for directions in decoded data first
-            if '/dir/' in decoded_data:
-                coords = extract_coordinates_from_directions_url(decoded_data)
-                if coords:
-                    return coords
-            
-            for pattern in patterns_to_try:
-                matches = re.findall(pattern, decoded_data)
-                if matches:
-                    lat, lon = matches[0]
-                    return float(lat), float(lon)
-        
+            logger.info("Checking decoded data part: %s", decoded_data)
+            return extract_coordinates_from_google_url(decoded_data)
+
     except Exception as e:
-        logger.error(f"Error in extract_coordinates_from_place_url_params: {e}")
+        logger.error("Error in extract_coordinates_from_place_url_params: %s", e)
     
     return None
 
@@ -283,6 +513,21 @@ def extract_coordinates_from_place_url_params(url: str) -> tuple[float, float] |
 def try_alternative_coordinate_resolution(place_id: str, headers: dict) -> tuple[float, float] | None:
     """
     Try alternative methods to resolve coordinates from a place ID.
+    Results are shared with try_direct_place_id_resolution through PLACE_ID_CACHE.
+    """
+    coords = PLACE_ID_CACHE.get(place_id)
+    if coords:
+        logger.info("Using cached coordinates for place ID %s: %s", place_id, coords)
+        return coords
+
+    coords = resolve_place_id_alternatives(place_id, headers)
+    PLACE_ID_CACHE.put(place_id, coords)
+    return coords
+
+
+def resolve_place_id_alternatives(place_id: str, headers: dict) -> tuple[float, float] | None:
+    """
+    Uncached body of try_alternative_coordinate_resolution.
     """
     try:
         # Method 1: Try using different Google domains that might not show consent
@@ -293,11 +538,11 @@ def try_alternative_coordinate_resolution(place_id: str, headers: dict) -> tuple
             "maps.google.ca",
         ]
         
-        for domain in alternative_domains:
+        def try_alternative_domain(domain: str) -> tuple[float, float] | None:
             try:
                 # Try the Maps API format that might work
                 alt_url = f"https://{domain}/maps/api/place/details/json?place_id={place_id}&fields=geometry&key="
-                logger.info(f"Trying alternative domain: {alt_url}")
+                logger.info("Trying alternative domain: %s", alt_url)
                 
                 # Use minimal headers to avoid triggering consent
                 minimal_headers = {
@@ -305,10 +550,9 @@ def try_alternative_coordinate_resolution(place_id: str, headers: dict) -> tuple
                     "Accept": "*/*"
                 }
                 
-                resp = requests.get(alt_url, headers=minimal_headers, timeout=5)
+                resp = SESSION.get(alt_url, headers=minimal_headers, timeout=5)
                 if resp.status_code == 200 and "geometry" in resp.text:
                     # Try to parse any coordinate-like numbers from the response
-                    import json
                     try:
                         data = resp.json()
                         if "result" in data and "geometry" in data["result"]:
@@ -318,8 +562,12 @@ def try_alternative_coordinate_resolution(place_id: str, headers: dict) -> tuple
                         pass
                         
             except Exception as e:
-                logger.info(f"Alternative domain {domain} failed: {e}")
-                continue
+                logger.info("Alternative domain %s failed: %s", domain, e)
+            return None
+        
+        coords = first_successful(try_alternative_domain, alternative_domains)
+        if coords:
+            return coords
         
         # Method 2: Try using a simple GET request with the place ID in a different format
         hex_parts = place_id.replace("1s", "").split(":")
@@ -328,44 +576,42 @@ def try_alternative_coordinate_resolution(place_id: str, headers: dict) -> tuple
                 # Sometimes we can construct a direct URL using the hex values
                 hex1, hex2 = hex_parts
                 simple_url = f"https://www.google.com/maps?cid={hex2}"
-                logger.info(f"Trying simple CID URL: {simple_url}")
+                logger.info("Trying simple CID URL: %s", simple_url)
                 
                 # Use a very basic user agent
                 basic_headers = {"User-Agent": "Mozilla/5.0"}
-                resp = requests.get(simple_url, headers=basic_headers, timeout=5, allow_redirects=False)
+                resp = SESSION.get(simple_url, headers=basic_headers, timeout=5, allow_redirects=False)
                 
                 # Check if we get a redirect with coordinates
                 if resp.status_code in [301, 302] and "Location" in resp.headers:
                     redirect_url = resp.headers["Location"]
-                    logger.info(f"Got redirect: {redirect_url}")
+                    logger.info("Got redirect: %s", redirect_url)
                     coords = extract_coordinates_from_google_url(redirect_url)
                     if coords:
                         return coords
                         
             except Exception as e:
-                logger.info(f"Simple CID method failed: {e}")
+                logger.info("Simple CID method failed: %s", e)
         
         # Method 3: Try a direct search approach
         try:
             search_url = f"https://www.google.com/search?q={place_id}+coordinates"
-            logger.info(f"Trying search approach: {search_url}")
+            logger.info("Trying search approach: %s", search_url)
             
             search_headers = {
                 "User-Agent": "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
             }
             
-            resp = requests.get(search_url, headers=search_headers, timeout=5)
-            if resp.status_code == 200:
-                # Look for coordinate patterns in the search results
-                coords = extract_coordinates_from_google_url(resp.text)
-                if coords:
-                    return coords
+            # Look for coordinate patterns in the search results
+            coords = scan_response_for_coordinates(search_url, search_headers, timeout=5)
+            if coords:
+                return coords
                     
         except Exception as e:
-            logger.info(f"Search method failed: {e}")
+            logger.info("Search method failed: %s", e)
             
     except Exception as e:
-        logger.error(f"Error in try_alternative_coordinate_resolution: {e}")
+        logger.error("Error in try_alternative_coordinate_resolution: %s", e)
     
     return None
 
@@ -374,9 +620,24 @@ def try_direct_place_id_resolution(place_id: str) -> tuple[float, float] | None:
     """
     Try to resolve coordinates directly from a place ID by making targeted requests.
     Place IDs like 1s0xd1ecca7e6530079:0x7eb7624ea64a4a4a contain hex coordinates.
+    Successful lookups are cached in PLACE_ID_CACHE.
+    """
+    coords = PLACE_ID_CACHE.get(place_id)
+    if coords:
+        logger.info("Using cached coordinates for place ID %s: %s", place_id, coords)
+        return coords
+
+    coords = resolve_place_id_directly(place_id)
+    PLACE_ID_CACHE.put(place_id, coords)
+    return coords
+
+
+def resolve_place_id_directly(place_id: str) -> tuple[float, float] | None:
+    """
+    Uncached body of try_direct_place_id_resolution.
     """
     try:
-        logger.info(f"Trying direct place ID resolution for: {place_id}")
+        logger.info("Trying direct place ID resolution for: %s", place_id)
         
         # Extract hex parts
         hex_parts = place_id.replace("1s", "").split(":")
@@ -384,7 +645,7 @@ def try_direct_place_id_resolution(place_id: str) -> tuple[float, float] | None:
             return None
             
         hex1, hex2 = hex_parts
-        logger.info(f"Extracted hex parts: {hex1}, {hex2}")
+        logger.info("Extracted hex parts: %s, %s", hex1, hex2)
         
         # Try several direct approaches
         headers = {
@@ -394,56 +655,59 @@ def try_direct_place_id_resolution(place_id: str) -> tuple[float, float] | None:
         # Method 1: Try direct CID redirect (most reliable)
         try:
             cid_url = f"https://www.google.com/maps?cid={hex2}"
-            logger.info(f"Trying CID redirect: {cid_url}")
+            logger.info("Trying CID redirect: %s", cid_url)
             
-            resp = requests.get(cid_url, headers=headers, timeout=5, allow_redirects=False)
+            resp = SESSION.get(cid_url, headers=headers, timeout=5, allow_redirects=False)
             if resp.status_code in [301, 302] and "Location" in resp.headers:
                 redirect_url = resp.headers["Location"]
-                logger.info(f"CID redirect location: {redirect_url}")
+                logger.info("CID redirect location: %s", redirect_url)
                 
                 if "consent.google.com" not in redirect_url:
                     coords = extract_coordinates_from_google_url(redirect_url)
                     if coords:
-                        logger.info(f"Success with CID redirect: {coords}")
+                        logger.info("Success with CID redirect: %s", coords)
                         return coords
         except Exception as e:
-            logger.info(f"CID redirect failed: {e}")
+            logger.info("CID redirect failed: %s", e)
         
         # Method 2: Try alternative domain approaches
         alternative_domains = ["maps.google.co.uk", "maps.google.de", "maps.google.ca"]
-        for domain in alternative_domains:
+        
+        def try_alternative_domain(domain: str) -> tuple[float, float] | None:
             try:
                 alt_url = f"https://{domain}/maps?cid={hex2}"
-                logger.info(f"Trying alternative domain: {alt_url}")
+                logger.info("Trying alternative domain: %s", alt_url)
                 
-                resp = requests.get(alt_url, headers=headers, timeout=3, allow_redirects=False)
+                resp = SESSION.get(alt_url, headers=headers, timeout=3, allow_redirects=False)
                 if resp.status_code in [301, 302] and "Location" in resp.headers:
                     redirect_url = resp.headers["Location"]
                     if "consent.google.com" not in redirect_url:
                         coords = extract_coordinates_from_google_url(redirect_url)
                         if coords:
-                            logger.info(f"Success with alternative domain {domain}: {coords}")
+                            logger.info("Success with alternative domain %s: %s", domain, coords)
                             return coords
             except Exception as e:
-                logger.info(f"Alternative domain {domain} failed: {e}")
-                continue
+                logger.info("Alternative domain %s failed: %s", domain, e)
+            return None
+        
+        coords = first_successful(try_alternative_domain, alternative_domains)
+        if coords:
+            return coords
         
         # Method 3: Try search approach
         try:
             search_url = f"https://www.google.com/search?q=site:maps.google.com+{hex2}"
-            logger.info(f"Trying search approach: {search_url}")
+            logger.info("Trying search approach: %s", search_url)
             
-            resp = requests.get(search_url, headers=headers, timeout=5)
-            if resp.status_code == 200:
-                coords = extract_coordinates_from_google_url(resp.text)
-                if coords:
-                    logger.info(f"Success with search approach: {coords}")
-                    return coords
+            coords = scan_response_for_coordinates(search_url, headers, timeout=5)
+            if coords:
+                logger.info("Success with search approach: %s", coords)
+                return coords
         except Exception as e:
-            logger.info(f"Search approach failed: {e}")
+            logger.info("Search approach failed: %s", e)
             
     except Exception as e:
-        logger.error(f"Direct place ID resolution failed: {e}")
+        logger.error("Direct place ID resolution failed: %s", e)
     
     return None
 
@@ -455,31 +719,16 @@ async def check_browser_health() -> bool:
     """
     try:
         from playwright.async_api import async_playwright
-        import asyncio
         
         logger.info("Testing headless browser health...")
         
         async def test_browser():
             try:
                 async with async_playwright() as p:
+                    # Same flags as the shared browser, so the check exercises the real configuration
                     browser = await p.chromium.launch(
                         headless=True,
-                        args=[
-                            '--no-sandbox',
-                            '--disable-dev-shm-usage',
-                            '--disable-web-security',
-                            '--disable-features=VizDisplayCompositor',
-                            '--disable-extensions',
-                            '--disable-plugins',
-                            '--disable-images',
-                            '--disable-javascript',
-                            '--disable-gpu',
-                            '--disable-software-rasterizer',
-                            '--disable-background-timer-throttling',
-                            '--disable-renderer-backgrounding',
-                            '--disable-backgrounding-occluded-windows',
-                            '--single-process',  # Help with server environments
-                        ]
+                        args=[*CHROMIUM_ARGS, '--disable-javascript'],
                     )
                     
                     context = await browser.new_context(
@@ -498,12 +747,12 @@ async def check_browser_health() -> bool:
                     return "Google" in title
                     
             except Exception as e:
-                logger.error(f"Browser test failed: {e}")
+                logger.error("Browser test failed: %s", e)
                 return False
         
         # Run with 10 second timeout
         result = await asyncio.wait_for(test_browser(), timeout=10.0)
-        logger.info(f"Browser health check: {'PASSED' if result else 'FAILED'}")
+        logger.info("Browser health check: %s", 'PASSED' if result else 'FAILED')
         return result
         
     except ImportError:
@@ -513,32 +762,70 @@ async def check_browser_health() -> bool:
         logger.error("Browser health check timed out")
         return False
     except Exception as e:
-        logger.error(f"Browser health check error: {e}")
+        logger.error("Browser health check error: %s", e)
         return False
 
 
+async def block_heavy_resources(route) -> None:
+    """
+    Playwright route handler that aborts requests we never need for reading the final URL.
+    """
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def update_browser_health() -> None:
+    """
+    Run the browser health check and record the result in BROWSER_HEALTHY.
+    """
+    global BROWSER_HEALTHY
+    
+    logger.info("Performing browser health check...")
+    try:
+        BROWSER_HEALTHY = await check_browser_health()
+        if BROWSER_HEALTHY:
+            logger.info("✅ Browser is healthy - headless browser resolution enabled")
+        else:
+            logger.warning("⚠️ Browser health check failed - headless browser resolution disabled")
+            logger.info("To fix this on a server, try running: playwright install-deps chromium")
+    except Exception as e:
+        logger.error("Browser health check error: %s", e)
+        BROWSER_HEALTHY = False
+        logger.warning("⚠️ Browser health check failed - headless browser resolution disabled")
+
+
+def start_browser_health_check() -> asyncio.Task:
+    """
+    Start the browser health check, once, and return its task so concurrent
+    callers all wait on the same check.
+    """
+    global BROWSER_HEALTH_TASK
+    
+    if BROWSER_HEALTH_TASK is None:
+        BROWSER_HEALTH_TASK = asyncio.create_task(update_browser_health())
+    return BROWSER_HEALTH_TASK
+
+
 async def try_headless_browser_resolution(url: str, browser_healthy: bool = True) -> tuple[float, float] | None:
     """
     Use a headless browser to load the Google Maps URL and extract coordinates
     from the final rendered page. This requires playwright to be installed.
     """
-    global BROWSER_HEALTHY, BROWSER_HEALTH_CHECKED
+    # Cheap HEAD request first - short links often redirect straight to a URL with
+    # coordinates, in which case there is no need to start a browser at all
+    try:
+        resp = await asyncio.to_thread(SESSION.head, url, allow_redirects=True, timeout=3)
+        coords = extract_coordinates_from_google_url(strip_consent_url(resp.url))
+        if coords:
+            logger.info("Found coordinates after HEAD redirect, skipping browser: %s", coords)
+            return coords
+    except Exception as e:
+        logger.info("HEAD redirect check failed: %s", e)
     
     # Perform lazy health check on first use
-    if not BROWSER_HEALTH_CHECKED:
-        logger.info("Performing browser health check...")
-        BROWSER_HEALTH_CHECKED = True
-        try:
-            BROWSER_HEALTHY = await check_browser_health()
-            if BROWSER_HEALTHY:
-                logger.info("✅ Browser is healthy - headless browser resolution enabled")
-            else:
-                logger.warning("⚠️ Browser health check failed - headless browser resolution disabled")
-                logger.info("To fix this on a server, try running: playwright install-deps chromium")
-        except Exception as e:
-            logger.error(f"Browser health check error: {e}")
-            BROWSER_HEALTHY = False
-            logger.warning("⚠️ Browser health check failed - headless browser resolution disabled")
+    await start_browser_health_check()
     
     if not BROWSER_HEALTHY:
         logger.info("Skipping headless browser - health check failed")
@@ -547,161 +834,138 @@ async def try_headless_browser_resolution(url: str, browser_healthy: bool = True
     try:
         # Try to import playwright - it may not be installed
         from playwright.async_api import async_playwright
-        import asyncio
         
         logger.info("Attempting headless browser resolution...")
         
         # Set a maximum timeout for the entire operation
         async def browser_operation():
-            browser = None
-            try:
-                async with async_playwright() as p:
-                    # Try with JavaScript disabled first (faster)
-                    for js_enabled in [False, True]:
-                        try:
-                            logger.info(f"Trying browser with JavaScript {'enabled' if js_enabled else 'disabled'}...")
-                            
-                            # Optimized browser args for server environments
-                            browser_args = [
-                                '--no-sandbox',
-                                '--disable-dev-shm-usage',
-                                '--disable-web-security',
-                                '--disable-features=VizDisplayCompositor',
-                                '--disable-extensions',
-                                '--disable-plugins',
-                                '--disable-images',  # Faster loading
-                                '--disable-gpu',
-                                '--disable-software-rasterizer',
-                                '--disable-background-timer-throttling',
-                                '--disable-renderer-backgrounding',
-                                '--disable-backgrounding-occluded-windows',
-                                '--disable-ipc-flooding-protection',
-                                '--single-process',  # Important for server environments
-                                '--no-zygote',  # Disable zygote process
-                                '--disable-sync',
-                                '--disable-default-apps',
-                                '--no-first-run',
-                                '--disable-crashpad',
-                            ]
-                            
-                            if not js_enabled:
-                                browser_args.append('--disable-javascript')
-                            
-                            browser = await p.chromium.launch(
-                                headless=True, 
-                                args=browser_args,
-                                # Additional options for server environments
-                                handle_sigint=False,
-                                handle_sigterm=False,
-                                handle_sighup=False,
-                            )
-                            
-                            context = await browser.new_context(
-                                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                                viewport={'width': 800, 'height': 600},  # Smaller viewport
-                                # Disable some features for performance
-                                java_script_enabled=js_enabled,
-                                bypass_csp=True,
-                            )
-                            
-                            page = await context.new_page()
-                            
+            async with async_playwright() as p:
+                try:
+                    browser = await p.chromium.launch(
+                        headless=True,
+                        args=list(CHROMIUM_ARGS),
+                        # Additional options for server environments
+                        handle_sigint=False,
+                        handle_sigterm=False,
+                        handle_sighup=False,
+                    )
+                except Exception as e:
+                    logger.error("Browser operation error: %s", e)
+                    return None
+
+                try:
+                    return await resolve_with_browser(browser)
+                finally:
+                    await browser.close()
+
+        async def resolve_with_browser(browser):
+            # Try with JavaScript disabled first (faster)
+            for js_enabled in [False, True]:
+                context = None
+                try:
+                    logger.info("Trying browser with JavaScript %s...", 'enabled' if js_enabled else 'disabled')
+                    
+                    # One browser serves both attempts; JavaScript is toggled per context
+                    context = await browser.new_context(
+                        user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                        viewport={'width': 800, 'height': 600},  # Smaller viewport
+                        # Disable some features for performance
+                        java_script_enabled=js_enabled,
+                        bypass_csp=True,
+                    )
+                    
+                    page = await context.new_page()
+                    await page.route("**/*", block_heavy_resources)
+                    
+                    try:
+                        # Navigate to the URL with shorter timeout. Without JavaScript only the
+                        # server-side redirects matter, so the first committed response is enough.
+                        logger.info("Loading URL: %s", url)
+                        await page.goto(
+                            url,
+                            wait_until="domcontentloaded" if js_enabled else "commit",
+                            timeout=4000,  # Even shorter timeout
+                        )
+                        logger.info("Page loaded successfully")
+                        
+                        # Wait briefly for initial content
+                        if js_enabled:
+                            await page.wait_for_timeout(300)
+                        
+                        # Get the final URL immediately
+                        final_url = page.url
+                        logger.info("Final URL: %s", final_url)
+                        
+                        # Try to extract coordinates from the final URL first
+                        coords = extract_coordinates_from_google_url(final_url)
+                        if coords:
+                            logger.info("Found coordinates in final URL: %s", coords)
+                            return coords
+                        
+                        # Only try consent handling if JavaScript is enabled
+                        if js_enabled:
+                            logger.info("Trying consent handling...")
                             try:
-                                # Navigate to the URL with shorter timeout
-                                logger.info(f"Loading URL: {url}")
-                                await page.goto(url, wait_until="domcontentloaded", timeout=4000)  # Even shorter timeout
-                                logger.info("Page loaded successfully")
-                                
-                                # Wait briefly for initial content
-                                await page.wait_for_timeout(300)
-                                
-                                # Get the final URL immediately
-                                final_url = page.url
-                                logger.info(f"Final URL: {final_url}")
-                                
-                                # Try to extract coordinates from the final URL first
-                                coords = extract_coordinates_from_google_url(final_url)
-                                if coords:
-                                    logger.info(f"Found coordinates in final URL: {coords}")
-                                    return coords
-                                
-                                # Only try consent handling if JavaScript is enabled
-                                if js_enabled:
-                                    logger.info("Trying consent handling...")
-                                    try:
-                                        # Simple consent button detection with very short timeouts
-                                        consent_selectors = [
-                                            'button:has-text("Accept all")',
-                                            'button:has-text("Aceitar")',
-                                        ]
-                                        
-                                        for selector in consent_selectors:
-                                            try:
-                                                elements = await page.locator(selector).count()
-                                                if elements > 0:
-                                                    logger.info(f"Clicking consent button: {selector}")
-                                                    await page.locator(selector).first.click(timeout=500)
-                                                    await page.wait_for_timeout(800)
-                                                    
-                                                    final_url = page.url
-                                                    logger.info(f"URL after consent: {final_url}")
-                                                    
-                                                    coords = extract_coordinates_from_google_url(final_url)
-                                                    if coords:
-                                                        logger.info(f"Found coordinates after consent: {coords}")
-                                                        return coords
-                                                    break
-                                            except Exception as e:
-                                                logger.info(f"Consent selector {selector} failed: {e}")
-                                                continue
-                                    except Exception as e:
-                                        logger.info(f"Consent handling error: {e}")
+                                # Simple consent button detection with very short timeouts
+                                consent_selectors = [
+                                    'button:has-text("Accept all")',
+                                    'button:has-text("Aceitar")',
+                                ]
                                 
-                                # Try page content as last resort (only if no JS, to avoid hanging)
-                                if not js_enabled:
+                                for selector in consent_selectors:
                                     try:
-                                        page_content = await page.content()
-                                        coords = extract_coordinates_from_google_url(page_content)
-                                        if coords:
-                                            logger.info(f"Found coordinates in page content: {coords}")
-                                            return coords
+                                        elements = await page.locator(selector).count()
+                                        if elements > 0:
+                                            logger.info("Clicking consent button: %s", selector)
+                                            await page.locator(selector).first.click(timeout=500)
+                                            await page.wait_for_timeout(800)
+                                            
+                                            final_url = page.url
+                                            logger.info("URL after consent: %s", final_url)
+                                            
+                                            coords = extract_coordinates_from_google_url(final_url)
+                                            if coords:
+                                                logger.info("Found coordinates after consent: %s", coords)
+                                                return coords
+                                            break
                                     except Exception as e:
-                                        logger.info(f"Page content extraction failed: {e}")
-                                
+                                        logger.info("Consent selector %s failed: %s", selector, e)
+                                        continue
                             except Exception as e:
-                                logger.info(f"Page operation failed (JS {'on' if js_enabled else 'off'}): {e}")
-                            finally:
-                                if browser:
-                                    await browser.close()
-                                    browser = None
-                                    
-                        except Exception as e:
-                            logger.info(f"Browser attempt failed (JS {'on' if js_enabled else 'off'}): {e}")
-                            if browser:
-                                try:
-                                    await browser.close()
-                                except:
-                                    pass
-                                browser = None
-                            continue
-                    
-                    logger.info("No coordinates found with headless browser")
-                    return None
+                                logger.info("Consent handling error: %s", e)
+                        
+                        # Try page content as last resort (only if no JS, to avoid hanging)
+                        if not js_enabled:
+                            try:
+                                await page.wait_for_load_state("domcontentloaded", timeout=2000)
+                                page_content = await page.content()
+                                coords = extract_coordinates_from_text(page_content)
+                                if coords:
+                                    logger.info("Found coordinates in page content: %s", coords)
+                                    return coords
+                            except Exception as e:
+                                logger.info("Page content extraction failed: %s", e)
+                        
+                    except Exception as e:
+                        logger.info("Page operation failed (JS %s): %s", 'on' if js_enabled else 'off', e)
                             
-            except Exception as e:
-                logger.error(f"Browser operation error: {e}")
-                if browser:
-                    try:
-                        await browser.close()
-                    except:
-                        pass
-                return None
+                except Exception as e:
+                    logger.info("Browser attempt failed (JS %s): %s", 'on' if js_enabled else 'off', e)
+                finally:
+                    if context:
+                        try:
+                            await context.close()
+                        except Exception:
+                            pass
+            
+            logger.info("No coordinates found with headless browser")
+            return None
         
         # Run the browser operation with a total timeout of 10 seconds (even shorter)
         try:
             logger.info("Starting browser operation with 10 second timeout...")
             coords = await asyncio.wait_for(browser_operation(), timeout=10.0)
-            logger.info(f"Browser operation completed: {coords}")
+            logger.info("Browser operation completed: %s", coords)
             return coords
         except asyncio.TimeoutError:
             logger.error("Headless browser operation timed out after 10 seconds")
@@ -711,146 +975,237 @@ async def try_headless_browser_resolution(url: str, browser_healthy: bool = True
         logger.info("Playwright not installed. To use headless browser resolution, install with: pip install playwright")
         return None
     except Exception as e:
-        logger.error(f"Headless browser resolution failed: {e}")
+        logger.error("Headless browser resolution failed: %s", e)
         return None
 
 
-def try_geocoding_fallback(url: str) -> tuple[float, float] | None:
+async def wait_for_nominatim_slot() -> None:
+    """
+    Wait until another Nominatim request is allowed. Their usage policy allows at most
+    one request per second, and this is shared by all concurrent geocoding lookups.
+    """
+    global NOMINATIM_LAST_REQUEST
+
+    async with NOMINATIM_RATE_LOCK:
+        loop = asyncio.get_running_loop()
+        delay = NOMINATIM_LAST_REQUEST + NOMINATIM_MIN_INTERVAL - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        NOMINATIM_LAST_REQUEST = loop.time()
+
+
+def is_word_char(char: str) -> bool:
+    """
+    Same notion of a word character as the regex \\w class.
+    """
+    return char.isalnum() or char == '_'
+
+
+def has_postal_code(text: str) -> bool:
+    """
+    Check whether the text contains a Portuguese postal code (format: NNNN-NNN) as a
+    separate word, like a \\b-delimited regex match, using plain string checks.
+    """
+    dash = text.find('-', 4)
+    while dash != -1:
+        start, end = dash - 4, dash + 4
+        if (
+            end <= len(text)
+            and text[start:dash].isdecimal()
+            and text[dash + 1:end].isdecimal()
+            and (start == 0 or not is_word_char(text[start - 1]))
+            and (end == len(text) or not is_word_char(text[end]))
+        ):
+            return True
+        dash = text.find('-', dash + 1)
+    return False
+
+
+def is_meaningful_part(part: str) -> bool:
+    """
+    Check whether an (already stripped) address part is worth a geocoding query:
+    longer than 3 characters and not just a number.
+    """
+    return len(part) > 3 and not part.replace(' ', '').isdigit()
+
+
+async def try_geocoding_fallback(url: str) -> tuple[float, float] | None:
     """
     Try to extract business name and address from the URL and geocode it
-    using a free geocoding service.
+    using a free geocoding service. Requests run in worker threads and the
+    politeness delay is an asyncio sleep, so the event loop is never blocked.
     """
     try:
-        import urllib.parse
-        import re
+        # Nothing to geocode when the URL already carries coordinates
+        coords = extract_coordinates_from_google_url(url)
+        if coords:
+            return coords
         
         # Extract business name and address from the URL path
         if '/place/' in url:
             place_part = url.split('/place/')[1].split('/')[0]
             # URL decode the place name
-            place_name = urllib.parse.unquote_plus(place_part.replace('+', ' '))
-            logger.info(f"Extracted place name: {place_name}")
+            place_name = unquote_plus(place_part.replace('+', ' '))
+            logger.info("Extracted place name: %s", place_name)
+            
+            # A "lat,lon" place is just coordinates, not something Nominatim can look up
+            if COORD_PAIR_PATTERN.fullmatch(place_name.replace(' ', '')):
+                return None
+            
+            coords = GEOCODE_PLACE_CACHE.get(place_name)
+            if coords:
+                logger.info("Using cached geocoding result for %s: %s", place_name, coords)
+                return coords
             
             # Try to extract different components from the place name
             search_queries = [place_name]  # Always start with full name
             
-            # Try to extract address components dynamically
-            if ',' in place_name:
-                parts = [part.strip() for part in place_name.split(',')]
-                
-                # Look for postal codes (format: NNNN-NNN)
-                postal_code_pattern = r'\b\d{4}-\d{3}\b'
-                
+            # Try to extract address components dynamically. Only parts with letters or a postal
+            # code can be geocoded; a name without at least two of them has no address to split,
+            # so only the full name is tried.
+            parts = [
+                part for part in (part.strip() for part in place_name.split(','))
+                if any(c.isalpha() for c in part) or has_postal_code(part)
+            ]
+            part_count = len(parts)
+            if part_count >= 2:
                 # Try to find city/location names and postal codes
                 for i, part in enumerate(parts):
                     # If this part contains a postal code, create address queries
-                    if re.search(postal_code_pattern, part):
+                    if has_postal_code(part):
                         # This part likely contains city and postal code
-                        if i > 0:
+                        if i > 0 and is_meaningful_part(parts[i-1]):
                             # Include the street part + city part
-                            street_and_city = ', '.join(parts[i-1:i+1])
-                            search_queries.append(f"{street_and_city}, Portugal")
+                            search_queries.append(f"{parts[i-1]}, {part}, Portugal")
                         
                         # Just the city part
-                        search_queries.append(f"{part}, Portugal")
+                        if is_meaningful_part(part):
+                            search_queries.append(f"{part}, Portugal")
                 
                 # Try different combinations of parts
-                if len(parts) >= 2:
-                    # Last two parts (often street + city)
+                # Last two parts (often street + city)
+                if is_meaningful_part(parts[-2]) and is_meaningful_part(parts[-1]):
                     search_queries.append(f"{parts[-2]}, {parts[-1]}, Portugal")
-                    
-                    # Just the last part (often the city)
+                
+                # Just the last part (often the city)
+                if is_meaningful_part(parts[-1]):
                     search_queries.append(f"{parts[-1]}, Portugal")
                 
                 # Try each part individually with Portugal
-                for part in parts[1:]:  # Skip first part (business name)
-                    if len(part.strip()) > 3:  # Only meaningful parts
-                        search_queries.append(f"{part.strip()}, Portugal")
+                for i in range(1, part_count):  # Skip first part (business name)
+                    if is_meaningful_part(parts[i]):
+                        search_queries.append(f"{parts[i]}, Portugal")
             
             # Remove duplicates while preserving order
-            seen = set()
-            unique_queries = []
-            for query in search_queries:
-                if query not in seen:
-                    seen.add(query)
-                    unique_queries.append(query)
+            unique_queries = list(dict.fromkeys(search_queries))
             
             headers = {
                 "User-Agent": "TelegramBot/1.0 (contact@example.com)"  # Nominatim requires a user agent
             }
             
-            for query in unique_queries:
+            async def geocode_query(query: str) -> tuple[float, float] | None:
+                cache_key = " ".join(query.split()).casefold()
+                coords = GEOCODE_QUERY_CACHE.get(cache_key)
+                if coords:
+                    logger.info("Using cached geocoding result for query %s: %s", query, coords)
+                    return coords
+                
                 try:
-                    nominatim_url = f"https://nominatim.openstreetmap.org/search?q={urllib.parse.quote(query)}&format=json&limit=3"
+                    # Be nice to the service: at most one request per second across all lookups
+                    await wait_for_nominatim_slot()
                     
-                    logger.info(f"Trying Nominatim geocoding with query: {query}")
-                    logger.info(f"URL: {nominatim_url}")
+                    logger.debug("Trying Nominatim geocoding with query: %s", query)
                     
-                    resp = requests.get(nominatim_url, headers=headers, timeout=10)
-                    logger.info(f"Nominatim response status: {resp.status_code}")
+                    resp = await asyncio.to_thread(
+                        SESSION.get,
+                        NOMINATIM_URL,
+                        params={"q": query, "format": "json", "limit": 1},
+                        headers=headers,
+                        timeout=10,
+                    )
+                    logger.debug("Nominatim response status: %s", resp.status_code)
                     
                     if resp.status_code == 200:
-                        data = resp.json()
-                        logger.info(f"Nominatim returned {len(data)} results")
+                        data = orjson.loads(resp.content)
+                        logger.debug("Nominatim returned %d results", len(data))
                         
                         if data and len(data) > 0:
-                            # Log all results for debugging
-                            for i, result in enumerate(data):
-                                logger.info(f"Result {i}: {result.get('display_name', 'No name')} - lat: {result.get('lat')}, lon: {result.get('lon')}")
-                            
-                            # Use the first result
+                            # Only the best match is requested and used
                             result = data[0]
+                            logger.debug(
+                                "Result: %s - lat: %s, lon: %s",
+                                result.get('display_name', 'No name'), result.get('lat'), result.get('lon'),
+                            )
                             if 'lat' in result and 'lon' in result:
                                 lat = float(result['lat'])
                                 lon = float(result['lon'])
-                                logger.info(f"Nominatim found coordinates: {lat}, {lon} for query: {query}")
+                                logger.info("Nominatim found coordinates: %s, %s for query: %s", lat, lon, query)
+                                GEOCODE_QUERY_CACHE.put(cache_key, (lat, lon))
                                 return lat, lon
                         else:
-                            logger.info(f"No results for query: {query}")
+                            logger.debug("No results for query: %s", query)
                     else:
-                        logger.info(f"Bad response from Nominatim: {resp.status_code} - {resp.text[:200]}")
-                        
-                    # Add a small delay between requests to be nice to the service
-                    import time
-                    time.sleep(1)
+                        logger.info("Bad response from Nominatim: %s - %s", resp.status_code, resp.text[:200])
                     
                 except Exception as e:
-                    logger.error(f"Error with query '{query}': {e}")
-                    continue
+                    logger.error("Error with query '%s': %s", query, e)
+                return None
+            
+            # Run a couple of queries at a time so one's round trip overlaps the next one's
+            # rate-limit wait. Queries go from most to least specific, so results are taken in
+            # that order: the first query that finds the place wins, even if a later one answers sooner
+            semaphore = asyncio.Semaphore(NOMINATIM_CONCURRENCY)
+            
+            async def bounded_geocode_query(query: str) -> tuple[float, float] | None:
+                async with semaphore:
+                    return await geocode_query(query)
+            
+            tasks = [asyncio.create_task(bounded_geocode_query(query)) for query in unique_queries]
+            try:
+                for task in tasks:
+                    coords = await task
+                    if coords:
+                        GEOCODE_PLACE_CACHE.put(place_name, coords)
+                        return coords
+            finally:
+                for task in tasks:
+                    task.cancel()
                     
     except Exception as e:
-        logger.error(f"Geocoding fallback failed: {e}")
+        logger.error("Geocoding fallback failed: %s", e)
     
     return None
 
 
+def first_segment(text: str) -> str | None:
+    """
+    Return the text before the first comma, stripped, if it's meaningful
+    (longer than 2 characters and containing at least one letter).
+    """
+    comma = text.find(',')
+    segment = (text if comma < 0 else text[:comma]).strip()
+    return segment if len(segment) > 2 and any(c.isalpha() for c in segment) else None
+
+
+@functools.lru_cache(maxsize=1024)
 def extract_place_name(url: str) -> str | None:
     """
     Extract place name from a Google Maps URL.
     Returns the business/place name if found, None otherwise.
+    Results are memoized per URL.
     """
     try:
-        import urllib.parse
-        
         if '/place/' in url:
             # Extract the place part from the URL
             place_part = url.split('/place/')[1].split('/')[0]
             # URL decode the place name
-            place_name = urllib.parse.unquote_plus(place_part.replace('+', ' '))
+            place_name = unquote_plus(place_part.replace('+', ' '))
             
-            # If there's a comma, take only the first part (usually the business name)
-            if ',' in place_name:
-                business_name = place_name.split(',')[0].strip()
-                # Only return if it's meaningful (not too short, not just numbers)
-                if len(business_name) > 2 and not business_name.replace(' ', '').isdigit():
-                    return business_name
-            else:
-                # No comma, return the whole name if meaningful
-                if len(place_name) > 2 and not place_name.replace(' ', '').isdigit():
-                    return place_name
+            # Take only the part before the first comma (usually the business name)
+            return first_segment(place_name)
                     
     except Exception as e:
-        logger.info(f"Failed to extract place name: {e}")
+        logger.info("Failed to extract place name: %s", e)
     
     return None
 
@@ -874,16 +1229,16 @@ def try_lightweight_browser_resolution(url: str) -> tuple[float, float] | None:
         
         try:
             # Get the page
-            logger.info(f"Loading URL with requests-html: {url}")
+            logger.info("Loading URL with requests-html: %s", url)
             r = session.get(url, timeout=10)
             
             # Try to extract coordinates from the URL first
             final_url = r.url
-            logger.info(f"Final URL: {final_url}")
+            logger.info("Final URL: %s", final_url)
             
             coords = extract_coordinates_from_google_url(final_url)
             if coords:
-                logger.info(f"Found coordinates in final URL: {coords}")
+                logger.info("Found coordinates in final URL: %s", coords)
                 return coords
             
             # If no coordinates in URL, try rendering JavaScript (if needed)
@@ -893,29 +1248,29 @@ def try_lightweight_browser_resolution(url: str) -> tuple[float, float] | None:
                 
                 # Check URL again after rendering
                 final_url = r.url
-                logger.info(f"URL after JS rendering: {final_url}")
+                logger.info("URL after JS rendering: %s", final_url)
                 
                 coords = extract_coordinates_from_google_url(final_url)
                 if coords:
-                    logger.info(f"Found coordinates after JS rendering: {coords}")
+                    logger.info("Found coordinates after JS rendering: %s", coords)
                     return coords
                 
                 # Try extracting from page content
-                coords = extract_coordinates_from_google_url(r.html.raw_html.decode())
+                coords = extract_coordinates_from_text(r.html.raw_html.decode())
                 if coords:
-                    logger.info(f"Found coordinates in page content: {coords}")
+                    logger.info("Found coordinates in page content: %s", coords)
                     return coords
                     
             except Exception as e:
-                logger.info(f"JavaScript rendering failed: {e}")
+                logger.info("JavaScript rendering failed: %s", e)
                 # Try without JS rendering
-                coords = extract_coordinates_from_google_url(r.html.raw_html.decode())
+                coords = extract_coordinates_from_text(r.html.raw_html.decode())
                 if coords:
-                    logger.info(f"Found coordinates in static content: {coords}")
+                    logger.info("Found coordinates in static content: %s", coords)
                     return coords
             
         except Exception as e:
-            logger.error(f"Lightweight browser request failed: {e}")
+            logger.error("Lightweight browser request failed: %s", e)
             
         finally:
             session.close()
@@ -924,7 +1279,7 @@ def try_lightweight_browser_resolution(url: str) -> tuple[float, float] | None:
         logger.info("requests-html not available. Install with: pip install requests-html")
         return None
     except Exception as e:
-        logger.error(f"Lightweight browser resolution failed: {e}")
+        logger.error("Lightweight browser resolution failed: %s", e)
         return None
     
     return None
@@ -939,52 +1294,89 @@ def extract_coordinates_from_directions_url(url: str) -> tuple[float, float] | N
     try:
         # Check if this is a directions URL
         if '/dir/' not in url:
-            logger.info(f"Not a directions URL (no /dir/ found): {url}")
+            logger.info("Not a directions URL (no /dir/ found): %s", url)
             return None
             
-        logger.info(f"Processing directions URL: {url}")
+        logger.info("Processing directions URL: %s", url)
         
         # Extract both starting and destination coordinates
         match = DIRECTIONS_PATTERN.search(url)
         if match:
             start_lat, start_lon = float(match.group(1)), float(match.group(2))
             dest_lat, dest_lon = float(match.group(3)), float(match.group(4))
-            logger.info(f"Found directions URL - Start: ({start_lat}, {start_lon}), Destination: ({dest_lat}, {dest_lon})")
-            logger.info(f"Returning destination coordinates: lat={dest_lat}, lon={dest_lon}")
+            logger.info("Found directions URL - Start: (%s, %s), Destination: (%s, %s)", start_lat, start_lon, dest_lat, dest_lon)
+            logger.info("Returning destination coordinates: lat=%s, lon=%s", dest_lat, dest_lon)
             return dest_lat, dest_lon
         else:
-            logger.info(f"DIRECTIONS_PATTERN did not match: {url}")
+            logger.info("DIRECTIONS_PATTERN did not match: %s", url)
             
         # Fallback: try to extract all coordinate pairs from the /dir/ part using a simpler approach
-        dir_part_match = re.search(r'/dir/([^?#]+)', url)
+        dir_part_match = DIRECTIONS_PATH_PATTERN.search(url)
         if dir_part_match:
             dir_part = dir_part_match.group(1)
-            logger.info(f"Extracted dir part: {dir_part}")
+            logger.info("Extracted dir part: %s", dir_part)
             # Find all coordinate pairs in the dir part
-            coord_matches = re.findall(r'(-?\d+\.\d+),(-?\d+\.\d+)', dir_part)
-            logger.info(f"Found {len(coord_matches)} coordinate pairs in directions URL: {coord_matches}")
+            coord_matches = COORD_PAIR_PATTERN.findall(dir_part)
+            logger.info("Found %s coordinate pairs in directions URL: %s", len(coord_matches), coord_matches)
             
             if len(coord_matches) >= 2:
                 # Take the second (destination) coordinates
                 lat, lon = float(coord_matches[1][0]), float(coord_matches[1][1])
-                logger.info(f"Extracted destination coordinates from directions URL (fallback): lat={lat}, lon={lon}")
+                logger.info("Extracted destination coordinates from directions URL (fallback): lat=%s, lon=%s", lat, lon)
                 return lat, lon
             elif len(coord_matches) == 1:
                 # Only one coordinate pair - might be destination only
                 lat, lon = float(coord_matches[0][0]), float(coord_matches[0][1])
-                logger.info(f"Extracted single coordinate from directions URL: lat={lat}, lon={lon}")
+                logger.info("Extracted single coordinate from directions URL: lat=%s, lon=%s", lat, lon)
                 return lat, lon
         else:
-            logger.info(f"Could not extract dir part from URL: {url}")
+            logger.info("Could not extract dir part from URL: %s", url)
                 
     except Exception as e:
-        logger.error(f"Error extracting coordinates from directions URL: {e}")
+        logger.error("Error extracting coordinates from directions URL: %s", e)
     
-    logger.info(f"Failed to extract any coordinates from directions URL: {url}")
+    logger.info("Failed to extract any coordinates from directions URL: %s", url)
     return None
 
 
+def try_quick_cid_redirect(place_id: str) -> tuple[float, float] | None:
+    """
+    Quick check: request the simple CID URL for a place ID without following
+    redirects, and parse coordinates from the redirect target if Google sends one.
+    """
+    hex_parts = place_id.replace("1s", "").split(":")
+    if len(hex_parts) != 2:
+        return None
+    
+    try:
+        simple_url = f"https://www.google.com/maps?cid={hex_parts[1]}"
+        logger.info("Trying simple CID URL: %s", simple_url)
+        
+        basic_headers = {"User-Agent": "Mozilla/5.0"}
+        resp = SESSION.get(simple_url, headers=basic_headers, timeout=3, allow_redirects=False)
+        
+        if resp.status_code in [301, 302] and "Location" in resp.headers:
+            redirect_url = resp.headers["Location"]
+            if "consent.google.com" not in redirect_url:
+                return extract_coordinates_from_google_url(redirect_url)
+    except Exception as e:
+        logger.info("Quick method failed: %s", e)
+    
+    return None
+
+
+def format_waze_reply(coords: tuple[float, float], place_text: str, is_directions_url: bool) -> str:
+    """
+    Build the reply message with the Waze link for the given coordinates.
+    """
+    lat, lon = coords
+    prefix = "🧭 " if is_directions_url else ""
+    return f"{prefix}Here's your Waze link{place_text}:\nhttps://ul.waze.com/ul?ll={lat},{lon}"
+
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    # The HTTP resolvers are blocking, so they run in worker threads via asyncio.to_thread
+    # to keep the event loop free for other users' messages.
     text = update.message.text.strip()
     
     # Extract all Google Maps URLs from the message text
@@ -1010,31 +1402,26 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     # Process the first Google Maps URL found
     short_url = google_maps_urls[0]
-    logger.info(f"Extracted Google Maps URL from text: {short_url}")
+    logger.info("Extracted Google Maps URL from text: %s", short_url)
     
     # Clean up the URL by removing trailing punctuation if it got caught
-    short_url = re.sub(r'[^\w\-\./?=&:]+$', '', short_url)
-    logger.info(f"Cleaned URL: {short_url}")
+    short_url = TRAILING_PUNCTUATION_PATTERN.sub('', short_url)
+    logger.info("Cleaned URL: %s", short_url)
 
     try:
-        # 1) GET with a browser User-Agent to force the full "@" or "!3d!4d" patterns
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/114.0.0.0 Safari/537.36"
-            )
-        }
-        resp = requests.get(short_url, headers=headers, timeout=10, allow_redirects=True)
+        # 1) GET with the session's browser User-Agent to force the full "@" or "!3d!4d" patterns
+        resp = await asyncio.to_thread(SESSION.get, short_url, timeout=10, allow_redirects=True)
         expanded_url = resp.url
-        logger.info(f"Expanded via GET (browser UA) → {expanded_url}")
+        logger.info("Expanded via GET (browser UA) → %s", expanded_url)
+        # Stripping only ever removes the consent wrapper, so the raw final URL is all we need to check
+        consent_detected = "consent.google." in expanded_url
 
         # 2) If Google shows a consent redirect, strip it out
         expanded_url = strip_consent_url(expanded_url)
-        logger.info(f"After stripping consent, URL is → {expanded_url}")
+        logger.info("After stripping consent, URL is → %s", expanded_url)
 
     except Exception as e:
-        logger.error(f"Error while expanding {short_url}: {e}")
+        logger.error("Error while expanding %s: %s", short_url, e)
         await update.message.reply_text("❗️ Couldn't expand that Google Maps link.")
         return
 
@@ -1050,123 +1437,40 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     else:
         place_text = f" for {place_name}" if place_name else ""
 
-    # 3) Try to parse numeric coordinates directly from the EXPANDED URL (not the original text)
-    coords = extract_coordinates_from_google_url(expanded_url)
-    if coords:
-        lat, lon = coords
-        if is_directions_url:
-            logger.info(f"Parsed destination coordinates from directions URL: lat={lat}, lon={lon}")
-            waze_link = f"https://ul.waze.com/ul?ll={lat},{lon}"
-            await update.message.reply_text(f"🧭 Here's your Waze link{place_text}:\n{waze_link}")
-        else:
-            logger.info(f"Parsed coordinates directly from expanded URL: lat={lat}, lon={lon}")
-            waze_link = f"https://ul.waze.com/ul?ll={lat},{lon}"
-            await update.message.reply_text(f"Here's your Waze link{place_text}:\n{waze_link}")
-        return
-
-    # 4) Try to extract coordinates from URL parameters/fragments of the EXPANDED URL
-    logger.info("Direct coordinate parsing failed, trying URL parameter parsing...")
-    coords = extract_coordinates_from_place_url_params(expanded_url)
-    if coords:
-        lat, lon = coords
-        logger.info(f"Parsed coordinates from URL parameters: lat={lat}, lon={lon}")
-        waze_link = f"https://ul.waze.com/ul?ll={lat},{lon}"
-        if is_directions_url:
-            await update.message.reply_text(f"🧭 Here's your Waze link{place_text}:\n{waze_link}")
-        else:
-            await update.message.reply_text(f"Here's your Waze link{place_text}:\n{waze_link}")
-        return
-
-    # 5) Check if we're hitting consent pages - if so, skip HTTP methods and go to browser
-    consent_detected = "consent.google.com" in resp.url or "consent.google.com" in expanded_url
-    
+    # 3) Build the ordered list of strategies as (description, resolver, argument, blocking).
+    # The URL parsers are cheap and run inline; the rest make HTTP requests in worker threads,
+    # except async resolvers, which are awaited directly.
+    strategies = [
+        # Numeric coordinates directly in the EXPANDED URL (not the original text)
+        ("expanded URL", extract_coordinates_from_google_url, expanded_url, False),
+        # Coordinates in URL parameters/fragments of the EXPANDED URL
+        ("URL parameters", extract_coordinates_from_place_url_params, expanded_url, False),
+    ]
+    place_id = extract_place_id(expanded_url)
     if consent_detected:
-        logger.info("Consent pages detected - skipping HTTP methods, going directly to lightweight browser...")
-        
-        # Try direct place ID resolution first (faster than browser)
-        place_id = extract_place_id(expanded_url)
-        if place_id:
-            logger.info("Trying direct place ID resolution...")
-            coords = try_direct_place_id_resolution(place_id)
-            if coords:
-                lat, lon = coords
-                logger.info(f"Parsed coordinates from direct place ID resolution: lat={lat}, lon={lon}")
-                waze_link = f"https://ul.waze.com/ul?ll={lat},{lon}"
-                if is_directions_url:
-                    await update.message.reply_text(f"🧭 Here's your Waze link{place_text}:\n{waze_link}")
-                else:
-                    await update.message.reply_text(f"Here's your Waze link{place_text}:\n{waze_link}")
-                return
-        
-        # Try lightweight browser (most accurate)
-        logger.info("Trying lightweight browser...")
-        coords = try_lightweight_browser_resolution(expanded_url)
-        if coords:
-            lat, lon = coords
-            logger.info(f"Parsed coordinates from lightweight browser: lat={lat}, lon={lon}")
-            waze_link = f"https://ul.waze.com/ul?ll={lat},{lon}"
-            if is_directions_url:
-                await update.message.reply_text(f"🧭 Here's your Waze link{place_text}:\n{waze_link}")
-            else:
-                await update.message.reply_text(f"Here's your Waze link{place_text}:\n{waze_link}")
-            return
-    else:
-        # No consent detected - try a few quick HTTP methods before browser
-        logger.info("No consent detected, trying quick HTTP methods...")
-        
-        # Try just one quick alternative URL
-        place_id = extract_place_id(expanded_url)
-        if place_id:
-            hex_parts = place_id.replace("1s", "").split(":")
-            if len(hex_parts) == 2:
-                try:
-                    hex1, hex2 = hex_parts
-                    simple_url = f"https://www.google.com/maps?cid={hex2}"
-                    logger.info(f"Trying simple CID URL: {simple_url}")
-                    
-                    basic_headers = {"User-Agent": "Mozilla/5.0"}
-                    resp = requests.get(simple_url, headers=basic_headers, timeout=3, allow_redirects=False)
-                    
-                    if resp.status_code in [301, 302] and "Location" in resp.headers:
-                        redirect_url = resp.headers["Location"]
-                        if "consent.google.com" not in redirect_url:
-                            coords = extract_coordinates_from_google_url(redirect_url)
-                            if coords:
-                                lat, lon = coords
-                                logger.info(f"Parsed coordinates from quick redirect: lat={lat}, lon={lon}")
-                                waze_link = f"https://ul.waze.com/ul?ll={lat},{lon}"
-                                if is_directions_url:
-                                    await update.message.reply_text(f"🧭 Here's your Waze link{place_text}:\n{waze_link}")
-                                else:
-                                    await update.message.reply_text(f"Here's your Waze link{place_text}:\n{waze_link}")
-                                return
-                except Exception as e:
-                    logger.info(f"Quick method failed: {e}")
+        # Consent pages block the quick HTTP methods, so go straight to the slower resolvers
+        logger.info("Consent pages detected - skipping quick HTTP methods")
+    elif place_id:
+        strategies.append(("quick CID redirect", try_quick_cid_redirect, place_id, True))
+    if place_id:
+        strategies.append(("direct place ID resolution", try_direct_place_id_resolution, place_id, True))
+    # Lightweight browser (most accurate, slowest)
+    strategies.append(("lightweight browser", try_lightweight_browser_resolution, expanded_url, True))
+    # Last resort: geocode the place name from the URL with Nominatim
+    strategies.append(("geocoding fallback", try_geocoding_fallback, expanded_url, True))
 
-            # If quick method didn't work, try comprehensive place ID resolution
-            logger.info("Quick method failed, trying direct place ID resolution...")
-            coords = try_direct_place_id_resolution(place_id)
-            if coords:
-                lat, lon = coords
-                logger.info(f"Parsed coordinates from direct place ID resolution: lat={lat}, lon={lon}")
-                waze_link = f"https://ul.waze.com/ul?ll={lat},{lon}"
-                if is_directions_url:
-                    await update.message.reply_text(f"🧭 Here's your Waze link{place_text}:\n{waze_link}")
-                else:
-                    await update.message.reply_text(f"Here's your Waze link{place_text}:\n{waze_link}")
-                return
-
-        # Try lightweight browser (most accurate)
-        logger.info("All quick methods failed, trying lightweight browser...")
-        coords = try_lightweight_browser_resolution(expanded_url)
+    for description, resolver, argument, blocking in strategies:
+        logger.info("Trying %s...", description)
+        if asyncio.iscoroutinefunction(resolver):
+            coords = await resolver(argument)
+        elif blocking:
+            coords = await asyncio.to_thread(resolver, argument)
+        else:
+            coords = resolver(argument)
         if coords:
             lat, lon = coords
-            logger.info(f"Parsed coordinates from lightweight browser: lat={lat}, lon={lon}")
-            waze_link = f"https://ul.waze.com/ul?ll={lat},{lon}"
-            if is_directions_url:
-                await update.message.reply_text(f"🧭 Here's your Waze link{place_text}:\n{waze_link}")
-            else:
-                await update.message.reply_text(f"Here's your Waze link{place_text}:\n{waze_link}")
+            logger.info("Parsed coordinates from %s: lat=%s, lon=%s", description, lat, lon)
+            await update.message.reply_text(format_waze_reply(coords, place_text, is_directions_url))
             return
 
     logger.info("❌ Failed to parse coordinates from expanded URL using all methods.")
@@ -1176,6 +1480,35 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     )
 
 
+def prewarm_dns() -> None:
+    """
+    Resolve the hosts used by the fallback resolvers once, so a caching system resolver
+    (nscd / systemd-resolved) is warm before the first message arrives. Without one, as in
+    the python:3.11-slim Docker image, this has no effect.
+    """
+    for host in PREWARM_HOSTS:
+        try:
+            socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+        except OSError as e:
+            logger.info("DNS prewarm for %s failed: %s", host, e)
+
+
+async def on_startup(application) -> None:
+    """
+    Prewarm DNS in a background thread so slow lookups never delay polling.
+    """
+    threading.Thread(target=prewarm_dns, name="dns-prewarm", daemon=True).start()
+
+
+async def on_shutdown(application) -> None:
+    """
+    Release long-lived resources when the bot stops.
+    """
+    if BROWSER_HEALTH_TASK is not None:
+        BROWSER_HEALTH_TASK.cancel()
+    SESSION.close()
+
+
 async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     await update.message.reply_text(
         "🗺️ Send me a message containing a Google Maps link, and I'll convert it to a Waze link!\n\n"
@@ -1193,9 +1526,14 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
 
 def main() -> None:
-    global BROWSER_HEALTHY
-    
-    app = ApplicationBuilder().token(TELEGRAM_TOKEN).build()
+    app = (
+        ApplicationBuilder()
+        .token(TELEGRAM_TOKEN)
+        .concurrent_updates(True)  # Handle messages from different chats in parallel
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+        .build()
+    )
 
     app.add_handler(CommandHandler("start", start_command))
     app.add_handler(MessageHandler(filters.TEXT & (~filters.COMMAND), handle_message))